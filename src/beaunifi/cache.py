@@ -0,0 +1,90 @@
+"""
+Content-addressed disk cache for beautify/minify results.
+Hits skip the beautifier/minifier entirely across server sessions.
+"""
+
+import hashlib
+import os
+import tempfile
+
+
+class DiskCache:
+    """
+    Content-addressed cache of processing results on disk.
+
+    Results are stored under one file per entry, named by a blake2b digest
+    of the input plus the operation parameters. Writes are atomic via
+    os.replace, and total size is bounded by evicting the least recently
+    used files (by mtime). The cache lives in ~/.cache/beaunifi by default,
+    can be relocated with BEAUNIFI_CACHE_DIR, and is disabled entirely when
+    BEAUNIFI_NO_CACHE is set.
+    """
+
+    def __init__(self, directory: str | None = None, max_bytes: int = 128 * 1024 * 1024) -> None:
+        self.directory = (
+            directory
+            or os.environ.get("BEAUNIFI_CACHE_DIR")
+            or os.path.join(os.path.expanduser("~"), ".cache", "beaunifi")
+        )
+        self.max_bytes = max_bytes
+        self.enabled = not os.environ.get("BEAUNIFI_NO_CACHE")
+
+    @staticmethod
+    def key(operation: str, code: str, indent_size: int = 0) -> str:
+        """Digest the input and operation parameters into a cache key."""
+        digest = hashlib.blake2b(code.encode('utf-8'), digest_size=16)
+        digest.update(f"|{operation}|{indent_size}".encode())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> str | None:
+        """Return the cached result for key, or None on a miss."""
+        if not self.enabled:
+            return None
+        path = os.path.join(self.directory, key)
+        try:
+            with open(path, encoding='utf-8') as fh:
+                result = fh.read()
+        except OSError:
+            return None
+        try:
+            os.utime(path)  # refresh mtime so LRU eviction keeps hot entries
+        except OSError:
+            pass
+        return result
+
+    def put(self, key: str, value: str) -> None:
+        """Store a result atomically; the cache is best-effort."""
+        if not self.enabled:
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory)
+            with os.fdopen(fd, 'w', encoding='utf-8') as fh:
+                fh.write(value)
+            os.replace(tmp_path, os.path.join(self.directory, key))
+        except OSError:
+            return
+        self._evict()
+
+    def _evict(self) -> None:
+        """Remove least-recently-used entries until under the size budget."""
+        try:
+            entries = []
+            for entry in os.scandir(self.directory):
+                if entry.is_file():
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        except OSError:
+            return
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_bytes:
+            return
+        entries.sort()
+        for _, size, path in entries:
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            if total <= self.max_bytes:
+                break
@@ -8,6 +8,11 @@ import asyncio
 import json
 from typing import Any
 
+try:
+    import orjson
+except ImportError:  # optional C-accelerated JSON
+    orjson = None
+
 from mcp.server.models import InitializationOptions
 from mcp.server import NotificationOptions, Server
 from mcp.server.stdio import stdio_server
@@ -30,28 +35,18 @@ from .utils import (
     smart_process,
 )
 
-# Server instance
-server = Server("beaunifi")
 
+def _dumps(obj: Any) -> str:
+    """Serialize a tool response as indented JSON, via orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, indent=2)
 
-@server.list_resources()
-async def handle_list_resources() -> list[Resource]:
-    """List available resources."""
-    return [
-        Resource(
-            uri="beaunifi://docs",
-            name="Beaunifi Documentation",
-            description="Documentation for the Beaunifi MCP server",
-            mimeType="text/plain",
-        )
-    ]
 
+# Server instance
+server = Server("beaunifi")
 
-@server.read_resource()
-async def handle_read_resource(uri: Any) -> str:
-    """Read a resource by URI."""
-    if str(uri) == "beaunifi://docs":
-        return """
+_DOCS = """
 # Beaunifi MCP Server
 
 Available tools:
@@ -64,135 +59,227 @@ Available tools:
 
 Use smart_process for the best experience when working with unknown files.
 """
-    raise ValueError(f"Unknown resource: {uri}")
 
+# Resource and tool schemas are constants; build them once at import instead
+# of reconstructing the nested objects on every list_resources/list_tools RPC.
+_RESOURCES = [
+    Resource(
+        uri="beaunifi://docs",
+        name="Beaunifi Documentation",
+        description="Documentation for the Beaunifi MCP server",
+        mimeType="text/plain",
+    )
+]
 
-@server.list_tools()
-async def handle_list_tools() -> list[Tool]:
-    """List available tools."""
-    return [
-        Tool(
-            name="beautify_js",
-            description="Beautify JavaScript code to make it readable",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "code": {
-                        "type": "string",
-                        "description": "JavaScript code to beautify",
-                    },
-                    "indent_size": {
-                        "type": "integer",
-                        "description": "Number of spaces for indentation",
-                        "default": 2,
-                    },
+_TOOLS = [
+    Tool(
+        name="beautify_js",
+        description="Beautify JavaScript code to make it readable",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "code": {
+                    "type": "string",
+                    "description": "JavaScript code to beautify",
+                },
+                "indent_size": {
+                    "type": "integer",
+                    "description": "Number of spaces for indentation",
+                    "default": 2,
                 },
-                "required": ["code"],
             },
-        ),
-        Tool(
-            name="minify_js",
-            description="Minify JavaScript code for production",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "code": {
-                        "type": "string",
-                        "description": "JavaScript code to minify",
-                    },
+            "required": ["code"],
+        },
+    ),
+    Tool(
+        name="minify_js",
+        description="Minify JavaScript code for production",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "code": {
+                    "type": "string",
+                    "description": "JavaScript code to minify",
                 },
-                "required": ["code"],
             },
-        ),
-        Tool(
-            name="beautify_css",
-            description="Beautify CSS code to make it readable",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "code": {
-                        "type": "string",
-                        "description": "CSS code to beautify",
-                    },
-                    "indent_size": {
-                        "type": "integer",
-                        "description": "Number of spaces for indentation",
-                        "default": 2,
-                    },
+            "required": ["code"],
+        },
+    ),
+    Tool(
+        name="beautify_css",
+        description="Beautify CSS code to make it readable",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "code": {
+                    "type": "string",
+                    "description": "CSS code to beautify",
+                },
+                "indent_size": {
+                    "type": "integer",
+                    "description": "Number of spaces for indentation",
+                    "default": 2,
                 },
-                "required": ["code"],
             },
-        ),
-        Tool(
-            name="minify_css",
-            description="Minify CSS code for production",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "code": {
-                        "type": "string",
-                        "description": "CSS code to minify",
-                    },
+            "required": ["code"],
+        },
+    ),
+    Tool(
+        name="minify_css",
+        description="Minify CSS code for production",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "code": {
+                    "type": "string",
+                    "description": "CSS code to minify",
                 },
-                "required": ["code"],
             },
-        ),
-        Tool(
-            name="is_minified",
-            description="Check if code appears to be minified based on line length and structure",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "code": {
-                        "type": "string",
-                        "description": "Code to check",
-                    },
-                    "file_type": {
-                        "type": "string",
-                        "enum": ["js", "css"],
-                        "description": "Type of code (js or css)",
-                    },
+            "required": ["code"],
+        },
+    ),
+    Tool(
+        name="is_minified",
+        description="Check if code appears to be minified based on line length and structure",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "code": {
+                    "type": "string",
+                    "description": "Code to check",
+                },
+                "file_type": {
+                    "type": "string",
+                    "enum": ["js", "css"],
+                    "description": "Type of code (js or css)",
                 },
-                "required": ["code", "file_type"],
             },
-        ),
-        Tool(
-            name="smart_process",
-            description="Smart workflow: auto-detect if minified, beautify if needed, process, and optionally re-minify. Perfect for editing minified files.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "code": {
-                        "type": "string",
-                        "description": "Code to process",
-                    },
-                    "file_type": {
-                        "type": "string",
-                        "enum": ["js", "css"],
-                        "description": "Type of code (js or css)",
-                    },
-                    "action": {
-                        "type": "string",
-                        "enum": ["read", "edit", "write"],
-                        "description": "Action to perform: 'read' returns beautified code, 'edit' applies modifications, 'write' returns minified result",
-                        "default": "read",
-                    },
-                    "modifications": {
-                        "type": "string",
-                        "description": "JSON string describing modifications to apply (for 'edit' action). Format: [{\"find\": \"text\", \"replace\": \"new_text\"}]",
-                    },
-                    "indent_size": {
-                        "type": "integer",
-                        "description": "Number of spaces for indentation when beautifying",
-                        "default": 2,
-                    },
+            "required": ["code", "file_type"],
+        },
+    ),
+    Tool(
+        name="smart_process",
+        description="Smart workflow: auto-detect if minified, beautify if needed, process, and optionally re-minify. Perfect for editing minified files.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "code": {
+                    "type": "string",
+                    "description": "Code to process",
+                },
+                "file_type": {
+                    "type": "string",
+                    "enum": ["js", "css"],
+                    "description": "Type of code (js or css)",
+                },
+                "action": {
+                    "type": "string",
+                    "enum": ["read", "edit", "write"],
+                    "description": "Action to perform: 'read' returns beautified code, 'edit' applies modifications, 'write' returns minified result",
+                    "default": "read",
+                },
+                "modifications": {
+                    "type": "string",
+                    "description": "JSON string describing modifications to apply (for 'edit' action). Format: [{\"find\": \"text\", \"replace\": \"new_text\"}]",
+                },
+                "indent_size": {
+                    "type": "integer",
+                    "description": "Number of spaces for indentation when beautifying",
+                    "default": 2,
                 },
-                "required": ["code", "file_type"],
             },
-        ),
+            "required": ["code", "file_type"],
+        },
+    ),
+]
+
+
+@server.list_resources()
+async def handle_list_resources() -> list[Resource]:
+    """List available resources."""
+    return _RESOURCES
+
+
+@server.read_resource()
+async def handle_read_resource(uri: Any) -> str:
+    """Read a resource by URI."""
+    if str(uri) == "beaunifi://docs":
+        return _DOCS
+    raise ValueError(f"Unknown resource: {uri}")
+
+
+@server.list_tools()
+async def handle_list_tools() -> list[Tool]:
+    """List available tools."""
+    return _TOOLS
+
+
+async def _handle_beautify_js(arguments: dict) -> list[TextContent]:
+    code = arguments.get("code", "")
+    indent_size = arguments.get("indent_size", 2)
+    result = await asyncio.to_thread(beautify_js, code, indent_size)
+    return [TextContent(type="text", text=result)]
+
+
+async def _handle_minify_js(arguments: dict) -> list[TextContent]:
+    code = arguments.get("code", "")
+    result = await asyncio.to_thread(minify_js, code)
+    return [TextContent(type="text", text=result)]
+
+
+async def _handle_beautify_css(arguments: dict) -> list[TextContent]:
+    code = arguments.get("code", "")
+    indent_size = arguments.get("indent_size", 2)
+    result = await asyncio.to_thread(beautify_css, code, indent_size)
+    return [TextContent(type="text", text=result)]
+
+
+async def _handle_minify_css(arguments: dict) -> list[TextContent]:
+    code = arguments.get("code", "")
+    result = await asyncio.to_thread(minify_css, code)
+    return [TextContent(type="text", text=result)]
+
+
+async def _handle_is_minified(arguments: dict) -> list[TextContent]:
+    code = arguments.get("code", "")
+    file_type = arguments.get("file_type", "js")
+    result = is_minified(code, file_type)
+    return [
+        TextContent(
+            type="text",
+            text=_dumps(
+                {
+                    "is_minified": result,
+                    "message": f"Code appears to be {'minified' if result else 'beautified/normal'}",
+                }
+            ),
+        )
     ]
 
 
+async def _handle_smart_process(arguments: dict) -> list[TextContent]:
+    result = await asyncio.to_thread(
+        smart_process,
+        code=arguments.get("code", ""),
+        file_type=arguments.get("file_type", "js"),
+        action=arguments.get("action", "read"),
+        modifications=arguments.get("modifications"),
+        indent_size=arguments.get("indent_size", 2),
+    )
+    return [TextContent(type="text", text=_dumps(result))]
+
+
+# O(1) dispatch on tool name instead of an if/elif chain of string compares
+_TOOL_DISPATCH = {
+    "beautify_js": _handle_beautify_js,
+    "minify_js": _handle_minify_js,
+    "beautify_css": _handle_beautify_css,
+    "minify_css": _handle_minify_css,
+    "is_minified": _handle_is_minified,
+    "smart_process": _handle_smart_process,
+}
+
+
 @server.call_tool()
 async def handle_call_tool(
     name: str, arguments: dict | None
@@ -202,96 +289,16 @@ async def handle_call_tool(
         arguments = {}
 
     try:
-        if name == "beautify_js":
-            code = arguments.get("code", "")
-            indent_size = arguments.get("indent_size", 2)
-            result = beautify_js(code, indent_size)
-            return [
-                TextContent(
-                    type="text",
-                    text=result,
-                )
-            ]
-
-        elif name == "minify_js":
-            code = arguments.get("code", "")
-            result = minify_js(code)
-            return [
-                TextContent(
-                    type="text",
-                    text=result,
-                )
-            ]
-
-        elif name == "beautify_css":
-            code = arguments.get("code", "")
-            indent_size = arguments.get("indent_size", 2)
-            result = beautify_css(code, indent_size)
-            return [
-                TextContent(
-                    type="text",
-                    text=result,
-                )
-            ]
-
-        elif name == "minify_css":
-            code = arguments.get("code", "")
-            result = minify_css(code)
-            return [
-                TextContent(
-                    type="text",
-                    text=result,
-                )
-            ]
-
-        elif name == "is_minified":
-            code = arguments.get("code", "")
-            file_type = arguments.get("file_type", "js")
-            result = is_minified(code, file_type)
-            return [
-                TextContent(
-                    type="text",
-                    text=json.dumps(
-                        {
-                            "is_minified": result,
-                            "message": f"Code appears to be {'minified' if result else 'beautified/normal'}",
-                        },
-                        indent=2,
-                    ),
-                )
-            ]
-
-        elif name == "smart_process":
-            code = arguments.get("code", "")
-            file_type = arguments.get("file_type", "js")
-            action = arguments.get("action", "read")
-            modifications = arguments.get("modifications")
-            indent_size = arguments.get("indent_size", 2)
-
-            result = smart_process(
-                code=code,
-                file_type=file_type,
-                action=action,
-                modifications=modifications,
-                indent_size=indent_size,
-            )
-            return [
-                TextContent(
-                    type="text",
-                    text=json.dumps(result, indent=2),
-                )
-            ]
-
-        else:
+        handler = _TOOL_DISPATCH.get(name)
+        if handler is None:
             raise ValueError(f"Unknown tool: {name}")
+        return await handler(arguments)
 
     except Exception as e:
         return [
             TextContent(
                 type="text",
-                text=json.dumps(
-                    {"error": str(e), "tool": name}, indent=2
-                ),
+                text=_dumps({"error": str(e), "tool": name}),
             )
         ]
 
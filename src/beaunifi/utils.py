@@ -3,46 +3,293 @@ Utility functions for beautifying and minifying JS/CSS code.
 Includes intelligent minification detection.
 """
 
+import copy
+import functools
 import re
 import json
-from typing import Literal
+import threading
+from collections import OrderedDict
+from typing import Any, Literal
 
 import jsbeautifier
 import cssbeautifier
-import jsmin
 import rcssmin
 
+try:
+    import rjsmin
+except ImportError:  # fall back to the pure-Python minifier
+    rjsmin = None
+import jsmin
+
+from .cache import DiskCache
+
+# rjsmin is a drop-in replacement for jsmin with a C extension; prefer it
+# when importable since it is orders of magnitude faster on large bundles.
+_jsmin = rjsmin.jsmin if rjsmin is not None else jsmin.jsmin
+
+try:
+    import orjson
+except ImportError:  # optional C-accelerated JSON
+    orjson = None
+
+try:
+    import numpy as _np
+    from numba import njit as _njit
+except ImportError:  # optional native byte scanner for is_minified
+    _np = None
+    _njit = None
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers can keep
+# catching the stdlib exception regardless of which parser is active.
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+_MISSING = object()
+
+# Minified-JS markers (no space after keywords/punctuation), compiled once as a
+# single alternation so detection is one scan instead of one search per pattern.
+_JS_MINIFIED_RE = re.compile(
+    r'(function\w*\()|(var\w)|(let\w)|(const\w)|(if\()|(for\()|(while\()|(else\{)|(\}\w)'
+)
+_COMMA_NOSPACE_RE = re.compile(r',\S')
+_COMMA_SPACE_RE = re.compile(r',\s')
+# Minified-CSS marker: colon or semicolon followed immediately by content.
+_CSS_NOSPACE_RE = re.compile(r'[:;]\S')
+# A line starting with two spaces or a tab, i.e. meaningful indentation.
+_INDENT_RE = re.compile(r'(?m)^(?:  |\t)')
+
+# Inputs above this size are classified from a head/tail sample instead of a
+# full scan, bounding is_minified latency on multi-MB bundles.
+_SAMPLE_THRESHOLD = 64 * 1024
+_SAMPLE_HEAD = 32 * 1024
+_SAMPLE_TAIL = 4 * 1024
+
+if _njit is not None:
+
+    @_njit(cache=True)
+    def _scan_counts_native(buf):  # pragma: no cover - numba-compiled
+        """Single pass over utf-8 bytes counting is_minified punctuation stats."""
+        indented = 0
+        comma_nospace = 0
+        comma_space = 0
+        css_nospace = 0
+        n = buf.shape[0]
+        # Indentation on the very first line has no preceding newline
+        if n >= 1 and buf[0] == 9:
+            indented += 1
+        elif n >= 2 and buf[0] == 32 and buf[1] == 32:
+            indented += 1
+        # findall is non-overlapping: a match at i consumes i+1, so another
+        # comma there cannot start a match. Each comma pattern scans
+        # independently, hence one next-allowed-start index per pattern.
+        nospace_from = 0
+        space_from = 0
+        for i in range(n - 1):
+            c = buf[i]
+            nxt = buf[i + 1]
+            next_is_space = (
+                nxt == 32 or nxt == 9 or nxt == 10 or nxt == 13 or nxt == 11 or nxt == 12
+            )
+            if c == 44:  # ','
+                if next_is_space:
+                    if i >= space_from:
+                        comma_space += 1
+                        space_from = i + 2
+                else:
+                    if i >= nospace_from:
+                        comma_nospace += 1
+                        nospace_from = i + 2
+            elif (c == 58 or c == 59) and not next_is_space:  # ':' or ';'
+                css_nospace += 1
+            elif c == 10:  # '\n'
+                if nxt == 9 or (nxt == 32 and i + 2 < n and buf[i + 2] == 32):
+                    indented += 1
+        return indented, comma_nospace, comma_space, css_nospace
+
+else:
+    _scan_counts_native = None
+
+
+def _pattern_counts(code: str) -> tuple[int, int, int, int]:
+    """
+    Count the is_minified punctuation statistics in one pass.
+
+    Returns (indented_lines, comma_without_space, comma_with_space,
+    colon_or_semicolon_without_space). Uses the numba byte scanner when the
+    optional dependency is installed, otherwise compiled-regex equivalents.
+    """
+    buf = code.encode('utf-8', 'replace')
+    if _scan_counts_native is not None:
+        return _scan_counts_native(_np.frombuffer(buf, dtype=_np.uint8))
+    # bytes membership drops into glibc memchr, so each probe is one
+    # vectorized scan that lets us skip a regex pass when its trigger
+    # character never occurs.
+    if b',' in buf:
+        comma_nospace = len(_COMMA_NOSPACE_RE.findall(code))
+        comma_space = len(_COMMA_SPACE_RE.findall(code))
+    else:
+        comma_nospace = comma_space = 0
+    css_nospace = 0
+    if b':' in buf or b';' in buf:
+        css_nospace = 1 if _CSS_NOSPACE_RE.search(code) else 0
+    indented = sum(1 for _ in _INDENT_RE.finditer(code))
+    return (indented, comma_nospace, comma_space, css_nospace)
+
+
+class _LRUCache:
+    """
+    Small bounded LRU cache keyed on a cheap fingerprint of the input.
+
+    Keys are (len(code), hash(code), ...) tuples rather than the code itself
+    so the cache never pins large source strings in memory.
+
+    The server runs beautify/minify work on thread-pool threads while
+    is_minified stays on the event loop, so lookups and stores race; a lock
+    around the tiny critical sections keeps get/move_to_end/evict atomic.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple, default: Any = None) -> Any:
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is _MISSING:
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def put(self, key: tuple, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+# The MCP read -> edit -> write cycle repeatedly feeds identical input through
+# detection and beautification, so memoize the deterministic entry points.
+_IS_MINIFIED_CACHE = _LRUCache(maxsize=256)
+_BEAUTIFY_JS_CACHE = _LRUCache(maxsize=32)
+_BEAUTIFY_CSS_CACHE = _LRUCache(maxsize=32)
+
+# Beautifying a large bundle is deterministic and can take seconds, so results
+# also persist on disk across sessions. Inputs below the threshold are cheap
+# enough to recompute and would only churn the cache directory.
+_DISK_CACHE = DiskCache()
+_DISK_CACHE_MIN_SIZE = 4096
+
+
+def _disk_cached(operation: str, code: str, indent_size: int, compute) -> str:
+    """Run compute() through the disk cache for large enough inputs."""
+    if len(code) < _DISK_CACHE_MIN_SIZE:
+        return compute()
+    key = DiskCache.key(operation, code, indent_size)
+    cached = _DISK_CACHE.get(key)
+    if cached is not None:
+        return cached
+    result = compute()
+    _DISK_CACHE.put(key, result)
+    return result
+
+# Option objects are immutable for our purposes, so build one per indent size
+# and reuse it instead of re-running ~15 attribute assignments on every call.
+_JS_OPTS_CACHE: dict[int, Any] = {}
+_CSS_OPTS_CACHE: dict[int, Any] = {}
+
+
+# The fixed option profiles as plain dicts; applied to the prototypes below
+# with a single __dict__.update instead of one attribute store per field.
+_JS_OPT_FIELDS = {
+    'max_preserve_newlines': 2,
+    'preserve_newlines': True,
+    'keep_array_indentation': False,
+    'break_chained_methods': False,
+    'indent_scripts': "normal",
+    'brace_style': "collapse",
+    'space_before_conditional': True,
+    'unescape_strings': False,
+    'jslint_happy': False,
+    'end_with_newline': True,
+    'wrap_line_length': 0,
+    'indent_inner_html': False,
+    'comma_first': False,
+    'e4x': False,
+    'indent_empty_lines': False,
+}
+
+_CSS_OPT_FIELDS = {
+    'max_preserve_newlines': 2,
+    'preserve_newlines': True,
+    'newline_between_rules': True,
+    'end_with_newline': True,
+    'indent_with_tabs': False,
+    'selector_separator_newline': True,
+}
+
+
+def _make_js_opts_proto() -> Any:
+    """Build the shared jsbeautifier options prototype, run once at import."""
+    opts = jsbeautifier.default_options()
+    opts.__dict__.update(_JS_OPT_FIELDS)
+    return opts
+
+
+def _make_css_opts_proto() -> Any:
+    """Build the shared cssbeautifier options prototype, run once at import."""
+    opts = cssbeautifier.default_options()
+    opts.__dict__.update(_CSS_OPT_FIELDS)
+    return opts
+
+
+# Fixed option profiles, frozen once so per-indent instances are a shallow
+# copy plus a single attribute store rather than a fresh default_options().
+_JS_OPTS_PROTO = _make_js_opts_proto()
+_CSS_OPTS_PROTO = _make_css_opts_proto()
+
+
+def _build_js_opts(indent_size: int) -> Any:
+    """Derive a jsbeautifier options object for a given indent size."""
+    opts = copy.copy(_JS_OPTS_PROTO)
+    opts.indent_size = indent_size
+    return opts
+
+
+def _build_css_opts(indent_size: int) -> Any:
+    """Derive a cssbeautifier options object for a given indent size."""
+    opts = copy.copy(_CSS_OPTS_PROTO)
+    opts.indent_size = indent_size
+    return opts
+
 
 def beautify_js(code: str, indent_size: int = 2) -> str:
     """
     Beautify JavaScript code.
-    
+
     Args:
         code: JavaScript code to beautify
         indent_size: Number of spaces for indentation
-        
+
     Returns:
         Beautified JavaScript code
     """
-    opts = jsbeautifier.default_options()
-    opts.indent_size = indent_size
-    opts.max_preserve_newlines = 2
-    opts.preserve_newlines = True
-    opts.keep_array_indentation = False
-    opts.break_chained_methods = False
-    opts.indent_scripts = "normal"
-    opts.brace_style = "collapse"
-    opts.space_before_conditional = True
-    opts.unescape_strings = False
-    opts.jslint_happy = False
-    opts.end_with_newline = True
-    opts.wrap_line_length = 0
-    opts.indent_inner_html = False
-    opts.comma_first = False
-    opts.e4x = False
-    opts.indent_empty_lines = False
-    
-    return jsbeautifier.beautify(code, opts)
+    key = (len(code), hash(code), indent_size)
+    cached = _BEAUTIFY_JS_CACHE.get(key, _MISSING)
+    if cached is not _MISSING:
+        return cached
+    opts = _JS_OPTS_CACHE.get(indent_size)
+    if opts is None:
+        opts = _JS_OPTS_CACHE.setdefault(indent_size, _build_js_opts(indent_size))
+    result = _disk_cached(
+        'beautify_js', code, indent_size, lambda: jsbeautifier.beautify(code, opts)
+    )
+    _BEAUTIFY_JS_CACHE.put(key, result)
+    return result
 
 
 def minify_js(code: str) -> str:
@@ -55,7 +302,7 @@ def minify_js(code: str) -> str:
     Returns:
         Minified JavaScript code
     """
-    return jsmin.jsmin(code)
+    return _disk_cached('minify_js', code, 0, lambda: _jsmin(code))
 
 
 def beautify_css(code: str, indent_size: int = 2) -> str:
@@ -69,16 +316,18 @@ def beautify_css(code: str, indent_size: int = 2) -> str:
     Returns:
         Beautified CSS code
     """
-    opts = cssbeautifier.default_options()
-    opts.indent_size = indent_size
-    opts.max_preserve_newlines = 2
-    opts.preserve_newlines = True
-    opts.newline_between_rules = True
-    opts.end_with_newline = True
-    opts.indent_with_tabs = False
-    opts.selector_separator_newline = True
-    
-    return cssbeautifier.beautify(code, opts)
+    key = (len(code), hash(code), indent_size)
+    cached = _BEAUTIFY_CSS_CACHE.get(key, _MISSING)
+    if cached is not _MISSING:
+        return cached
+    opts = _CSS_OPTS_CACHE.get(indent_size)
+    if opts is None:
+        opts = _CSS_OPTS_CACHE.setdefault(indent_size, _build_css_opts(indent_size))
+    result = _disk_cached(
+        'beautify_css', code, indent_size, lambda: cssbeautifier.beautify(code, opts)
+    )
+    _BEAUTIFY_CSS_CACHE.put(key, result)
+    return result
 
 
 def minify_css(code: str) -> str:
@@ -91,7 +340,7 @@ def minify_css(code: str) -> str:
     Returns:
         Minified CSS code
     """
-    return rcssmin.cssmin(code)
+    return _disk_cached('minify_css', code, 0, lambda: rcssmin.cssmin(code))
 
 
 def is_minified(code: str, file_type: Literal["js", "css"]) -> bool:
@@ -113,37 +362,56 @@ def is_minified(code: str, file_type: Literal["js", "css"]) -> bool:
     """
     if not code or not code.strip():
         return False
-    
-    lines = code.split('\n')
-    total_lines = len(lines)
+
+    key = (len(code), hash(code), file_type)
+    cached = _IS_MINIFIED_CACHE.get(key, _MISSING)
+    if cached is not _MISSING:
+        return cached
+    result = _is_minified_impl(code, file_type)
+    _IS_MINIFIED_CACHE.put(key, result)
+    return result
+
+
+is_minified.cache_clear = _IS_MINIFIED_CACHE.clear  # type: ignore[attr-defined]
+
+
+def _is_minified_impl(code: str, file_type: Literal["js", "css"]) -> bool:
+    """Heuristic core of is_minified; assumes non-empty input."""
+    # The heuristics are statistical, so a head/tail sample of a huge bundle
+    # classifies the same as the whole file at a fraction of the scan cost.
+    if len(code) > _SAMPLE_THRESHOLD:
+        code = code[:_SAMPLE_HEAD] + code[-_SAMPLE_TAIL:]
+
     content_length = len(code)
-    
+    nl_count = code.count('\n')
+    total_lines = nl_count + 1
+
     # Single line with any code is likely minified
-    if total_lines == 1 and len(code.strip()) > 10:
+    if nl_count == 0 and len(code.strip()) > 10:
         return True
-    
-    # Calculate average line length
-    non_empty_lines = [line for line in lines if line.strip()]
-    if not non_empty_lines:
+
+    # Newline-dense code that also carries indentation is pretty-printed;
+    # decide without touching any regex
+    if nl_count / content_length > 0.05 and ('\n  ' in code or '\n\t' in code):
         return False
-    
-    avg_line_length = sum(len(line) for line in non_empty_lines) / len(non_empty_lines)
-    
+
+    # Approximate average line length without materializing per-line strings
+    avg_line_length = (content_length - nl_count) / total_lines
+
     # Very long average lines suggest minification
     if avg_line_length > 200:
         return True
-    
+
     # Check for minimal newlines relative to content length
     newline_ratio = total_lines / content_length
-    
+
     # Minified code has very few newlines relative to content
     if content_length > 500 and newline_ratio < 0.01:
         return True
-    
-    # Check for meaningful indentation in non-minified code
-    indented_lines = sum(
-        1 for line in lines 
-        if line.startswith('  ') or line.startswith('\t')
+
+    # Punctuation statistics, computed in a single pass over the input
+    indented_lines, comma_without_space, comma_with_space, css_nospace = (
+        _pattern_counts(code)
     )
     
     # If we have many lines but very little indentation, likely minified
@@ -153,25 +421,12 @@ def is_minified(code: str, file_type: Literal["js", "css"]) -> bool:
     
     # File type specific checks
     if file_type == "js":
-        # Check for patterns common in minified JS
-        # No spaces after keywords like function, var, let, const, if, for, while
-        patterns = [
-            r'function\w*\(',
-            r'var\w',
-            r'let\w',
-            r'const\w',
-            r'if\(',
-            r'for\(',
-            r'while\(',
-            r'else\{',
-            r'\}\w',  # closing brace followed immediately by word
-        ]
-        minified_patterns = sum(1 for pattern in patterns if re.search(pattern, code))
-        
-        # Check for lack of spaces after commas (common in minified code)
-        comma_without_space = len(re.findall(r',[^\s]', code))
-        comma_with_space = len(re.findall(r',\s', code))
-        
+        # Check for patterns common in minified JS: no spaces after keywords
+        # like function, var, let, const, if, for, while. One finditer pass;
+        # lastindex tells us which alternative hit, so distinct-group counting
+        # matches the old one-search-per-pattern behavior.
+        minified_patterns = len({m.lastindex for m in _JS_MINIFIED_RE.finditer(code)})
+
         # If there are more commas without space than with, likely minified
         if comma_without_space > comma_with_space and comma_without_space > 1:
             minified_patterns += 2
@@ -181,18 +436,79 @@ def is_minified(code: str, file_type: Literal["js", "css"]) -> bool:
             return True
             
     elif file_type == "css":
-        # Check for patterns common in minified CSS
-        # No space after colon or semicolon
-        colon_without_space = len(re.findall(r':[^\s]', code))
-        semicolon_without_space = len(re.findall(r';[^\s]', code))
-        
-        # If we have these patterns and reasonable length, likely minified
-        if (colon_without_space > 0 or semicolon_without_space > 0) and avg_line_length > 30:
+        # Check for patterns common in minified CSS: no space after colon or
+        # semicolon. If present and lines are reasonably long, likely minified.
+        if avg_line_length > 30 and css_nospace:
             return True
     
     return False
 
 
+_IDENTIFIER_RE = re.compile(r'[A-Za-z_][A-Za-z0-9_]*\Z')
+
+
+@functools.lru_cache(maxsize=128)
+def _word_pattern(find: str) -> re.Pattern:
+    """Compiled word-boundary pattern for an identifier find, cached."""
+    return re.compile(rf'\b{re.escape(find)}\b')
+
+
+def _apply_mods(code: str, mods: list) -> str:
+    """
+    Apply a list of {"find": ..., "replace": ...} modifications to code.
+
+    Finds that are plain identifiers are replaced on word boundaries, so
+    renaming `add` does not mangle `addEventListener`. Two or more
+    modifications are applied in a single scan via a compiled alternation
+    instead of one full-string pass per entry.
+    """
+    if len(mods) < 2:
+        for mod in mods:
+            find = mod.get("find", "")
+            replace = mod.get("replace", "")
+            if _IDENTIFIER_RE.match(find):
+                code = _word_pattern(find).sub(lambda _m, r=replace: r, code)
+            else:
+                code = code.replace(find, replace)
+        return code
+
+    mapping = {mod.get("find", ""): mod.get("replace", "") for mod in mods}
+    if "" in mapping:
+        # An empty find degenerates to insert-everywhere; keep the original
+        # sequential semantics rather than encoding it in the alternation.
+        for mod in mods:
+            code = code.replace(mod.get("find", ""), mod.get("replace", ""))
+        return code
+
+    # Longer finds first so overlapping patterns prefer the longest match;
+    # identifier finds keep their word-boundary semantics inside the
+    # alternation (the boundaries are zero-width, so group(0) is the find).
+    parts = []
+    for find in sorted(mapping, key=len, reverse=True):
+        escaped = re.escape(find)
+        if _IDENTIFIER_RE.match(find):
+            escaped = rf'\b{escaped}\b'
+        parts.append(escaped)
+    pattern = re.compile("|".join(parts))
+    return pattern.sub(lambda m: mapping[m.group(0)], code)
+
+
+# Template for smart_process results; each call takes a C-level dict copy and
+# fills in the per-call fields instead of rebuilding the literal. A slotted
+# dataclass was considered but the public contract is a plain dict, which the
+# stdlib-json fallback also serializes without extra hooks.
+_RESULT_TEMPLATE = {
+    "was_minified": False,
+    "was_beautified": False,
+    "action": "",
+    "file_type": "",
+    "original_length": 0,
+    "final_length": 0,
+    "code": "",
+    "message": "",
+}
+
+
 def smart_process(
     code: str,
     file_type: Literal["js", "css"],
@@ -213,30 +529,28 @@ def smart_process(
         action: Action to perform - 'read', 'edit', or 'write'
         modifications: JSON string of modifications for 'edit' action
                       Format: [{"find": "text", "replace": "new_text"}]
+                      Finds are matched against the working (beautified)
+                      code, i.e. the same text a 'read' action returns
         indent_size: Indentation size for beautification
         
     Returns:
         Dictionary with processing results
     """
-    result = {
-        "was_minified": False,
-        "was_beautified": False,
-        "action": action,
-        "file_type": file_type,
-        "original_length": len(code),
-        "final_length": 0,
-        "code": "",
-        "message": "",
-    }
+    result = _RESULT_TEMPLATE.copy()
+    result["action"] = action
+    result["file_type"] = file_type
+    result["original_length"] = len(code)
     
     # Step 1: Detect if minified
     minified = is_minified(code, file_type)
     result["was_minified"] = minified
     
     working_code = code
-    
-    # Step 2: Beautify if minified
-    if minified:
+
+    # Step 2: Beautify if minified. A 'write' with no modifications never
+    # looks at the beautified text, so skip the round-trip (and its two
+    # large intermediate strings) and minify the original directly.
+    if minified and (action != "write" or modifications):
         if file_type == "js":
             working_code = beautify_js(code, indent_size)
         else:  # css
@@ -252,29 +566,26 @@ def smart_process(
         result["final_length"] = len(working_code)
         
     elif action == "edit":
-        # Apply modifications (first on original, then beautify if needed)
-        working_code = code  # Start with original code
-        
+        # Apply modifications to the working code, i.e. the beautified text
+        # when the input was minified -- the same text a 'read' returns
         if modifications:
             try:
-                mods = json.loads(modifications)
+                mods = _json_loads(modifications)
                 if isinstance(mods, list):
-                    for mod in mods:
-                        find_text = mod.get("find", "")
-                        replace_text = mod.get("replace", "")
-                        working_code = working_code.replace(find_text, replace_text)
+                    working_code = _apply_mods(working_code, mods)
                     result["modifications_applied"] = len(mods)
                 else:
                     result["error"] = "Modifications must be a list"
             except json.JSONDecodeError as e:
                 result["error"] = f"Invalid modifications JSON: {str(e)}"
         
-        # Now beautify the modified code
-        if file_type == "js":
-            working_code = beautify_js(working_code, indent_size)
-        else:  # css
-            working_code = beautify_css(working_code, indent_size)
-        
+        # Beautify the modified code, unless step 2 already beautified it
+        if not result["was_beautified"]:
+            if file_type == "js":
+                working_code = beautify_js(working_code, indent_size)
+            else:  # css
+                working_code = beautify_css(working_code, indent_size)
+
         result["code"] = working_code
         result["message"] = "Modifications applied. Use 'write' action to get minified result."
         result["final_length"] = len(working_code)
@@ -283,12 +594,9 @@ def smart_process(
         # Apply modifications if any, then minify
         if modifications:
             try:
-                mods = json.loads(modifications)
+                mods = _json_loads(modifications)
                 if isinstance(mods, list):
-                    for mod in mods:
-                        find_text = mod.get("find", "")
-                        replace_text = mod.get("replace", "")
-                        working_code = working_code.replace(find_text, replace_text)
+                    working_code = _apply_mods(working_code, mods)
             except json.JSONDecodeError:
                 pass  # Ignore modification errors on write
         
@@ -9,6 +9,7 @@ import os
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
+from beaunifi.cache import DiskCache
 from beaunifi.utils import (
     beautify_js,
     minify_js,
@@ -85,6 +86,23 @@ def test_is_minified_detection():
     print("  ✓ Minification detection works")
 
 
+def test_is_minified_cache():
+    """Test that memoized detection stays consistent across repeat calls."""
+    print("Testing minification detection cache...")
+
+    is_minified.cache_clear()
+    code = "function test(){return 1}"
+    first = is_minified(code, "js")
+    second = is_minified(code, "js")
+    assert first == second == True, "Cached result should match first call"
+
+    # Same code, different file type must not share a cache entry
+    assert is_minified(".a{color:red}", "css")
+    is_minified.cache_clear()
+
+    print("  ✓ Minification detection cache works")
+
+
 def test_smart_process():
     """Test smart process workflow."""
     print("Testing smart process...")
@@ -102,18 +120,59 @@ def test_smart_process():
     assert result["was_re_minified"] == True
     assert "\n" not in result["code"].strip()
     
-    # Edit action with modifications
+    # Edit action with modifications (finds match the beautified code)
     result = smart_process(
         minified_js,
         "js",
         action="edit",
-        modifications='[{"find": "var a=1", "replace": "var b=2"}]'
+        modifications='[{"find": "var a = 1", "replace": "var b = 2"}]'
     )
     assert "var b = 2" in result["code"]
-    
+
+    # Multiple modifications are applied in one pass
+    result = smart_process(
+        "function add(x,y){return x+y}",
+        "js",
+        action="edit",
+        modifications='[{"find": "add", "replace": "sum"}, {"find": "return", "replace": "return "}]'
+    )
+    assert "sum" in result["code"]
+    assert result["modifications_applied"] == 2
+
+    # Identifier finds replace whole words only
+    result = smart_process(
+        "var add = 1; var addend = 2;\n",
+        "js",
+        action="edit",
+        modifications='[{"find": "add", "replace": "sum"}]'
+    )
+    assert "var sum = 1" in result["code"]
+    assert "addend" in result["code"], "Word-boundary rename must not touch addend"
+
     print("  ✓ Smart process works")
 
 
+def test_disk_cache():
+    """Test the content-addressed disk cache roundtrip."""
+    print("Testing disk cache...")
+
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = DiskCache(directory=tmp)
+        cache.enabled = True  # ignore BEAUNIFI_NO_CACHE from the caller's env
+        key = DiskCache.key("beautify_js", "function a(){}", 2)
+        assert cache.get(key) is None, "Fresh cache should miss"
+        cache.put(key, "function a() {}\n")
+        assert cache.get(key) == "function a() {}\n", "Cache should return stored result"
+
+        # Different operation or indent must produce a different key
+        assert key != DiskCache.key("minify_js", "function a(){}", 2)
+        assert key != DiskCache.key("beautify_js", "function a(){}", 4)
+
+    print("  ✓ Disk cache works")
+
+
 def test_file_type_detection():
     """Test file type detection from extension."""
     print("Testing file type detection...")
@@ -139,7 +198,9 @@ def run_all_tests():
         test_js_beautify_minify()
         test_css_beautify_minify()
         test_is_minified_detection()
+        test_is_minified_cache()
         test_smart_process()
+        test_disk_cache()
         test_file_type_detection()
         
         print()